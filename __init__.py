@@ -6,6 +6,7 @@ Track Hanzi characters learned per deck with HSK and frequency breakdowns.
 from aqt import mw, gui_hooks
 from aqt.qt import QAction
 
+from .character_data import get_character_data
 from .stats_dialog import show_stats_dialog
 
 
@@ -16,5 +17,19 @@ def setup_menu():
     mw.form.menuTools.addAction(action)
 
 
+def prewarm_character_data():
+    """Load the character datasets in the background so the dialog opens quickly."""
+    mw.taskman.run_in_background(get_character_data, on_prewarm_done)
+
+
+def on_prewarm_done(future):
+    """Report a failed background load (Anki only surfaces it through the future)."""
+    try:
+        future.result()
+    except Exception as e:
+        print(f"Warning: Could not preload character data: {e}")
+
+
 # Initialize addon when Anki starts
 gui_hooks.main_window_did_init.append(setup_menu)
+gui_hooks.main_window_did_init.append(prewarm_character_data)
@@ -4,8 +4,43 @@ Loads HSK 2012, HSK 2021, and frequency data from CSV files.
 """
 
 import csv
+import functools
+import io
 import os
-from typing import Dict, List, Set
+import pickle
+import threading
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+# Dataset files the character maps are built from
+DATA_FILES = ('hsk2012-chars.csv', 'hsk30-chars.csv', 'mega_hanzi_compilation.csv')
+
+# Parsed maps are cached here; bump the version when the cached layout changes
+CACHE_FILE = 'character_maps.pkl'
+CACHE_VERSION = 1
+
+# Category labels indexed by level (index 0 = not in HSK)
+HSK_2012_KEYS = ('', 'Level 1', 'Level 2', 'Level 3', 'Level 4', 'Level 5', 'Level 6')
+HSK_2021_KEYS = ('', 'Band 1', 'Band 2', 'Band 3', 'Band 4', 'Band 5', 'Band 6',
+                 'Bands 7-9', 'Bands 7-9', 'Bands 7-9')
+
+# Upper rank bound of each frequency band, and the label for each band
+# (the trailing empty label covers ranks past the last threshold)
+FREQUENCY_THRESHOLDS = (500, 1000, 1500, 2000)
+FREQUENCY_KEYS = ('Rank 1-500', 'Rank 501-1000', 'Rank 1001-1500', 'Rank 1501-2000', '')
+
+# Category names in display order
+HSK_2012_CATEGORIES = HSK_2012_KEYS[1:]
+HSK_2021_CATEGORIES = HSK_2021_KEYS[1:8]
+FREQUENCY_CATEGORIES = FREQUENCY_KEYS[:-1]
+
+# Categorization of an empty character set, shared by every empty input
+EMPTY_CATEGORIZED = {
+    'hsk_2012': dict.fromkeys(HSK_2012_CATEGORIES, frozenset()),
+    'hsk_2021': dict.fromkeys(HSK_2021_CATEGORIES, frozenset()),
+    'frequency': dict.fromkeys(FREQUENCY_CATEGORIES, frozenset()),
+}
 
 
 class CharacterData:
@@ -15,35 +50,119 @@ class CharacterData:
         self.hsk_2012_map: Dict[str, int] = {}  # char -> level (1-6)
         self.hsk_2021_map: Dict[str, int] = {}  # char -> level (1-7, where 7 = bands 7-9)
         self.frequency_rank_map: Dict[str, int] = {}  # char -> frequency rank
+        self.frequency_category_map: Dict[str, str] = {}  # char -> frequency band label
 
-        # Load data
-        self._load_hsk_2012()
-        self._load_hsk_2021()
-        self._load_frequency()
+        # category name -> all characters in that category
+        self._hsk_2012_buckets: Dict[str, frozenset] = {}
+        self._hsk_2021_buckets: Dict[str, frozenset] = {}
+        self._frequency_buckets: Dict[str, frozenset] = {}
+
+        # Load data, preferring the pickled maps from a previous run
+        if not self._load_cache():
+            self._load_hsk_2012()
+            self._load_hsk_2021()
+            self._load_frequency()
+            self._save_cache()
+
+        self._build_frequency_categories()
+        self._build_category_buckets()
 
     def _get_data_path(self, filename: str) -> str:
         """Get path to data file in datasets directory."""
         addon_dir = os.path.dirname(__file__)
         return os.path.join(addon_dir, 'datasets', filename)
 
+    def _get_cache_path(self) -> str:
+        """Get path to the parsed-maps cache in the addon's user_files directory."""
+        addon_dir = os.path.dirname(__file__)
+        return os.path.join(addon_dir, 'user_files', CACHE_FILE)
+
+    def _load_cache(self) -> bool:
+        """
+        Load the character maps from the pickle cache.
+
+        Returns:
+            True if a cache newer than every dataset file was loaded
+        """
+        cache_path = self._get_cache_path()
+
+        try:
+            data_mtime = max(os.path.getmtime(self._get_data_path(name)) for name in DATA_FILES)
+            if os.path.getmtime(cache_path) < data_mtime:
+                return False
+
+            with open(cache_path, 'rb') as f:
+                version, hsk_2012_map, hsk_2021_map, frequency_rank_map = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable character data cache: {e}")
+            return False
+
+        if version != CACHE_VERSION:
+            return False
+
+        self.hsk_2012_map = hsk_2012_map
+        self.hsk_2021_map = hsk_2021_map
+        self.frequency_rank_map = frequency_rank_map
+        return True
+
+    def _save_cache(self):
+        """Pickle the character maps so later runs can skip CSV parsing."""
+        # Don't cache partial data from a missing or broken dataset file
+        if not (self.hsk_2012_map and self.hsk_2021_map and self.frequency_rank_map):
+            return
+
+        cache_path = self._get_cache_path()
+        data = (CACHE_VERSION, self.hsk_2012_map, self.hsk_2021_map, self.frequency_rank_map)
+
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Warning: Could not write character data cache: {e}")
+
+    def _read_columns(self, csv_path: str, *columns: str) -> Iterator[Tuple[str, ...]]:
+        """
+        Yield the given columns of each CSV row as a tuple.
+
+        Column indices are resolved once from the header, so rows are read as
+        plain lists instead of building a dict per row like csv.DictReader.
+        Files without any quoting are split with str.split, skipping the csv
+        module entirely. Rows too short to contain every requested column
+        are skipped.
+        """
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        if '"' in content:
+            reader = csv.reader(io.StringIO(content))
+        else:
+            # No quoted fields, so plain splitting parses rows exactly like csv
+            reader = (line.split(',') for line in content.splitlines())
+
+        header = next(reader, [])
+        indices = [header.index(column) for column in columns]
+        width = max(indices) + 1
+        get_columns = itemgetter(*indices)
+        for row in reader:
+            if len(row) >= width:
+                yield get_columns(row)
+
     def _load_hsk_2012(self):
         """Load HSK 2.0 (2012) character data from hsk2012-chars.csv"""
         csv_path = self._get_data_path('hsk2012-chars.csv')
 
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    char = row['Hanzi']
-                    level_str = row['Level']
-
-                    try:
-                        level = int(level_str)
-                    except ValueError:
-                        continue
-
-                    # Store simplified character
-                    self.hsk_2012_map[char] = level
+            for char, level_str in self._read_columns(csv_path, 'Hanzi', 'Level'):
+                try:
+                    level = int(level_str)
+                except ValueError:
+                    continue
+
+                # Store simplified character
+                self.hsk_2012_map[char] = level
         except FileNotFoundError:
             print(f"Warning: HSK 2012 data file not found: {csv_path}")
         except Exception as e:
@@ -54,24 +173,19 @@ class CharacterData:
         csv_path = self._get_data_path('hsk30-chars.csv')
 
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    char = row['Hanzi']
-                    level_str = row['Level']
-
-                    # Handle "7-9" for bands 7-9
-                    if level_str == "7-9":
-                        # Store as level 7 for simplicity (could also be 8 or 9)
-                        level = 7
-                    else:
-                        try:
-                            level = int(level_str)
-                        except ValueError:
-                            continue
-
-                    # Store simplified character only
-                    self.hsk_2021_map[char] = level
+            for char, level_str in self._read_columns(csv_path, 'Hanzi', 'Level'):
+                # Handle "7-9" for bands 7-9
+                if level_str == "7-9":
+                    # Store as level 7 for simplicity (could also be 8 or 9)
+                    level = 7
+                else:
+                    try:
+                        level = int(level_str)
+                    except ValueError:
+                        continue
+
+                # Store simplified character only
+                self.hsk_2021_map[char] = level
         except FileNotFoundError:
             print(f"Warning: HSK 2021 data file not found: {csv_path}")
         except Exception as e:
@@ -82,23 +196,43 @@ class CharacterData:
         csv_path = self._get_data_path('mega_hanzi_compilation.csv')
 
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Get simplified character only (Jun Da frequency is based on simplified)
-                    simplified = row.get('simplified', '')
-
-                    # Parse frequency rank (Jun Da)
-                    freq_str = row.get('frequency_junda', '')
-                    if freq_str and freq_str.isdigit():
-                        freq_rank = int(freq_str)
-                        if simplified:
-                            self.frequency_rank_map[simplified] = freq_rank
+            # Simplified character only (Jun Da frequency is based on simplified)
+            rows = self._read_columns(csv_path, 'simplified', 'frequency_junda')
+            self.frequency_rank_map.update(
+                (simplified, int(freq_str))
+                for simplified, freq_str in rows
+                if simplified and freq_str.isdigit()
+            )
         except FileNotFoundError:
             print(f"Warning: Frequency data file not found: {csv_path}")
         except Exception as e:
             print(f"Error loading frequency data: {e}")
 
+    def _build_frequency_categories(self):
+        """Precompute the frequency band label of every ranked character."""
+        self.frequency_category_map = {}
+        for char, rank in self.frequency_rank_map.items():
+            category = FREQUENCY_KEYS[bisect_left(FREQUENCY_THRESHOLDS, rank)]
+            if category:
+                self.frequency_category_map[char] = category
+
+    def _build_category_buckets(self):
+        """Precompute the full character set of every category."""
+        self._hsk_2012_buckets = self._group_by_category(
+            (char, HSK_2012_KEYS[level]) for char, level in self.hsk_2012_map.items())
+        self._hsk_2021_buckets = self._group_by_category(
+            (char, HSK_2021_KEYS[level]) for char, level in self.hsk_2021_map.items())
+        self._frequency_buckets = self._group_by_category(self.frequency_category_map.items())
+
+    @staticmethod
+    def _group_by_category(char_categories: Iterable[Tuple[str, str]]) -> Dict[str, frozenset]:
+        """Group (char, category name) pairs into category name -> frozenset of chars."""
+        groups: Dict[str, Set[str]] = {}
+        for char, category in char_categories:
+            if category:
+                groups.setdefault(category, set()).add(char)
+        return {category: frozenset(chars) for category, chars in groups.items()}
+
     def get_hsk_2012_level(self, char: str) -> int:
         """Get HSK 2012 level (1-6) for a character, or 0 if not in HSK."""
         return self.hsk_2012_map.get(char, 0)
@@ -113,19 +247,7 @@ class CharacterData:
 
     def get_frequency_category(self, char: str) -> str:
         """Get frequency category (ranks 1-500, 501-1000, etc.) or empty string."""
-        rank = self.get_frequency_rank(char)
-        if rank == 0:
-            return ""
-        elif rank <= 500:
-            return "Rank 1-500"
-        elif rank <= 1000:
-            return "Rank 501-1000"
-        elif rank <= 1500:
-            return "Rank 1001-1500"
-        elif rank <= 2000:
-            return "Rank 1501-2000"
-        else:
-            return ""
+        return self.frequency_category_map.get(char, "")
 
     def get_official_hsk_2012_characters(self) -> Dict[str, Set[str]]:
         """
@@ -177,65 +299,52 @@ class CharacterData:
         """
         Categorize a set of characters into HSK levels and frequency bands.
 
+        Results are memoized per distinct character set, so callers must treat
+        the returned dicts and sets as read-only.
+
         Returns:
             Dict with keys 'hsk_2012', 'hsk_2021', 'frequency', each containing
             a dict mapping category names to sets of characters.
         """
-        result = {
+        if not characters:
+            return EMPTY_CATEGORIZED
+        if not isinstance(characters, frozenset):
+            characters = frozenset(characters)
+        return self._categorize_frozen(characters)
+
+    @functools.lru_cache(maxsize=64)
+    def _categorize_frozen(self, characters: frozenset) -> Dict[str, Dict[str, Set[str]]]:
+        """Categorize a frozen character set (memoized backend of categorize_characters)."""
+        # Intersections run in C over the smaller of the two sets
+        empty = frozenset()
+        return {
             'hsk_2012': {
-                'Level 1': set(),
-                'Level 2': set(),
-                'Level 3': set(),
-                'Level 4': set(),
-                'Level 5': set(),
-                'Level 6': set(),
+                name: characters & self._hsk_2012_buckets.get(name, empty)
+                for name in HSK_2012_CATEGORIES
             },
             'hsk_2021': {
-                'Band 1': set(),
-                'Band 2': set(),
-                'Band 3': set(),
-                'Band 4': set(),
-                'Band 5': set(),
-                'Band 6': set(),
-                'Bands 7-9': set(),
+                name: characters & self._hsk_2021_buckets.get(name, empty)
+                for name in HSK_2021_CATEGORIES
             },
             'frequency': {
-                'Rank 1-500': set(),
-                'Rank 501-1000': set(),
-                'Rank 1001-1500': set(),
-                'Rank 1501-2000': set(),
-            }
+                name: characters & self._frequency_buckets.get(name, empty)
+                for name in FREQUENCY_CATEGORIES
+            },
         }
 
-        for char in characters:
-            # HSK 2012
-            hsk_2012_level = self.get_hsk_2012_level(char)
-            if hsk_2012_level > 0:
-                result['hsk_2012'][f'Level {hsk_2012_level}'].add(char)
-
-            # HSK 2021
-            hsk_2021_level = self.get_hsk_2021_level(char)
-            if hsk_2021_level > 0:
-                if hsk_2021_level >= 7:
-                    result['hsk_2021']['Bands 7-9'].add(char)
-                else:
-                    result['hsk_2021'][f'Band {hsk_2021_level}'].add(char)
-
-            # Frequency
-            freq_category = self.get_frequency_category(char)
-            if freq_category:
-                result['frequency'][freq_category].add(char)
-
-        return result
-
 
 # Global instance (will be initialized by the addon)
 character_data = None
 
+# Guards creation of the global instance, which may be prewarmed in the background
+_character_data_lock = threading.Lock()
+
 
 def get_character_data() -> CharacterData:
     """Get the global CharacterData instance, creating it if necessary."""
     global character_data
     if character_data is None:
-        character_data = CharacterData()
+        with _character_data_lock:
+            if character_data is None:
+                character_data = CharacterData()
     return character_data
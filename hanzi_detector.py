@@ -2,17 +2,22 @@
 Hanzi character detection utilities for Anki addon.
 """
 
-import re
 import unicodedata
 from typing import Set, List
 
 
+# CJK Unified Ideographs (incl. Extension A) and Compatibility Ideographs as a
+# set of characters, so whole strings can be filtered at C speed
+_CJK_CHARS = frozenset(chr(o) for start, end in ((0x3400, 0x9fff), (0xf900, 0xfaff))
+                       for o in range(start, end + 1))
+
+# Compatibility ideographs are the only matches that NFC normalization can change
+_CJK_COMPAT_CHARS = frozenset(chr(o) for o in range(0xf900, 0xfb00))
+
+
 class HanziDetector:
     """Detect and extract Hanzi characters from text."""
 
-    # Unicode range for CJK Unified Ideographs
-    CJK_PATTERN = re.compile(r'[\u3400-\u9fff\uf900-\ufaff]')
-
     @staticmethod
     def is_hanzi(char: str) -> bool:
         """
@@ -27,14 +32,13 @@ class HanziDetector:
         if not char:
             return False
 
-        try:
-            name = unicodedata.name(char)
-            return ('CJK UNIFIED IDEOGRAPH' in name or
-                    'CJK COMPATIBILITY IDEOGRAPH' in name or
-                    'BOPOMOFO' in name)
-        except ValueError:
-            # Character has no name (control character or invalid)
-            return False
+        o = ord(char)
+        return ((0x4e00 <= o <= 0x9fff) or      # CJK Unified Ideographs
+                (0x3400 <= o <= 0x4dbf) or      # Extension A (not the Yijing hexagrams after it)
+                (0xf900 <= o <= 0xfaff) or      # CJK Compatibility Ideographs
+                (0x20000 <= o <= 0x3134f) or    # Extensions B-G, Compatibility Supplement
+                (0x3100 <= o <= 0x312f) or      # Bopomofo
+                (0x31a0 <= o <= 0x31bf))        # Bopomofo Extended
 
     @staticmethod
     def extract_hanzi(text: str) -> Set[str]:
@@ -47,25 +51,46 @@ class HanziDetector:
         Returns:
             Set of unique Hanzi characters in normalized form
         """
-        if not text:
+        # ASCII-only text (English fields, markup) cannot contain Hanzi;
+        # CPython answers isascii() from the string header without scanning
+        if not text or text.isascii():
             return set()
 
-        chars = set()
-        for char in text:
-            if HanziDetector.CJK_PATTERN.match(char):
-                # Normalize to NFC form (canonical composition)
-                normalized = unicodedata.normalize('NFC', char)
-                chars.add(normalized)
+        # Set intersection scans the string in C; only unique matches reach Python
+        found = _CJK_CHARS.intersection(text)
 
-        return chars
+        # Unified ideographs are already in NFC form; only compatibility
+        # ideographs need normalizing to their canonical equivalents
+        if found.isdisjoint(_CJK_COMPAT_CHARS):
+            return set(found)
+        return {unicodedata.normalize('NFC', char) for char in found}
 
     @staticmethod
     def extract_from_fields(fields: List[str], field_selection: str) -> Set[str]:
         """
-        Extract Hanzi characters from note fields based on selection mode.
+        Extract Hanzi characters from a list of note fields.
 
         Args:
             fields: List of field values from a note (split by \\x1F)
+            field_selection: Selection mode, as for extract_from_note
+
+        Returns:
+            Set of unique Hanzi characters found
+        """
+        if not fields:
+            return set()
+        return HanziDetector.extract_from_note('\x1f'.join(fields), field_selection)
+
+    @staticmethod
+    def extract_from_note(flds: str, field_selection: str) -> Set[str]:
+        """
+        Extract Hanzi characters from a note's raw field string.
+
+        Only the selected field is sliced out of the string, instead of
+        splitting it into every field.
+
+        Args:
+            flds: Note field values joined by the \\x1F separator
             field_selection: How to select fields:
                 - "all": Extract from all fields
                 - "sortField": Extract only from first field (sort field)
@@ -74,28 +99,30 @@ class HanziDetector:
         Returns:
             Set of unique Hanzi characters found
         """
-        if not fields:
+        if not flds:
             return set()
 
-        chars = set()
-
         if field_selection == "all":
-            # Extract from all fields
-            for field in fields:
-                chars.update(HanziDetector.extract_hanzi(field))
+            # The separator is not a Hanzi, so the joined fields can be scanned as-is
+            return HanziDetector.extract_hanzi(flds)
 
-        elif field_selection == "sortField":
-            # Extract only from first field (sort field)
-            if len(fields) > 0:
-                chars.update(HanziDetector.extract_hanzi(fields[0]))
+        if field_selection == "sortField":
+            return HanziDetector.extract_hanzi(flds.partition('\x1f')[0])
 
-        elif field_selection.isdigit():
-            # Extract from specific field number (1-indexed)
+        if field_selection.isdigit():
+            # Skip to the start of the requested field (1-indexed)
             field_idx = int(field_selection) - 1
-            if 0 <= field_idx < len(fields):
-                chars.update(HanziDetector.extract_hanzi(fields[field_idx]))
-
-        return chars
+            if field_idx < 0:
+                return set()
+            start = 0
+            for _ in range(field_idx):
+                start = flds.find('\x1f', start) + 1
+                if start == 0:
+                    return set()
+            end = flds.find('\x1f', start)
+            return HanziDetector.extract_hanzi(flds[start:end] if end != -1 else flds[start:])
+
+        return set()
 
     @staticmethod
     def count_hanzi_in_text(text: str) -> int:
@@ -108,12 +135,8 @@ class HanziDetector:
         Returns:
             Number of Hanzi characters found
         """
-        if not text:
+        if not text or text.isascii():
             return 0
 
-        count = 0
-        for char in text:
-            if HanziDetector.CJK_PATTERN.match(char):
-                count += 1
-
-        return count
+        # map() and sum() classify and count every character in C
+        return sum(map(_CJK_CHARS.__contains__, text))
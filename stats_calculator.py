@@ -43,6 +43,12 @@ class StatsCalculator:
         self.col = collection
         self.config = config
         self.character_data = get_character_data()
+        self.show_categories = config.get('showCategories', True)
+
+        # (note id, field mode) -> (note mod time, Hanzi in that note), shared
+        # by every query made through this calculator; edited notes have a
+        # newer mod time and are extracted again
+        self._note_hanzi_cache: Dict[Tuple[int, str], Tuple[int, frozenset]] = {}
 
     def calculate_deck_stats(self, deck_id: int, include_subdecks: bool = True) -> DeckStatistics:
         """
@@ -73,19 +79,23 @@ class StatsCalculator:
         # Get field selection mode from config
         field_mode = self.config.get('fieldToUseForStats', 'sortField')
 
-        # Query 1: All cards (including new/unseen cards)
-        stats.total_hanzi = self._get_hanzi_from_cards(deck_ids, include_new=True, field_mode=field_mode)
-
-        # Query 2: Only reviewed cards
-        stats.reviewed_hanzi = self._get_hanzi_from_cards(deck_ids, include_new=False, field_mode=field_mode)
+        # All cards (including new/unseen cards) and reviewed cards in one query
+        stats.total_hanzi, stats.reviewed_hanzi = self._get_hanzi_total_and_reviewed(deck_ids, field_mode)
 
-        # Categorize characters
-        if self.config.get('showCategories', True):
-            stats.total_categorized = self.character_data.categorize_characters(stats.total_hanzi)
-            stats.reviewed_categorized = self.character_data.categorize_characters(stats.reviewed_hanzi)
+        self._categorize_stats(stats)
 
         return stats
 
+    def _categorize_stats(self, stats: DeckStatistics):
+        """Fill in the category breakdowns of a stats object, if enabled."""
+        if self.show_categories:
+            stats.total_categorized = self.character_data.categorize_characters(stats.total_hanzi)
+            if stats.reviewed_hanzi == stats.total_hanzi:
+                # Everything has been reviewed; the breakdowns are identical
+                stats.reviewed_categorized = stats.total_categorized
+            else:
+                stats.reviewed_categorized = self.character_data.categorize_characters(stats.reviewed_hanzi)
+
     def calculate_all_decks_stats(self, include_subdecks: bool = True) -> List[DeckStatistics]:
         """
         Calculate statistics for all decks.
@@ -107,86 +117,70 @@ class StatsCalculator:
 
         return all_stats
 
-    def _get_hanzi_from_cards(self, deck_ids: List[int], include_new: bool, field_mode: str) -> Set[str]:
+    def _get_note_hanzi(self, note_id: int, note_mod: int, fields_str: str, field_mode: str) -> frozenset:
+        """Get the Hanzi in a note's selected field(s), extracting each note version only once."""
+        key = (note_id, field_mode)
+        cached = self._note_hanzi_cache.get(key)
+        if cached is not None and cached[0] == note_mod:
+            return cached[1]
+        # Extract Hanzi from the selected field(s) without splitting all fields
+        chars = frozenset(HanziDetector.extract_from_note(fields_str, field_mode))
+        self._note_hanzi_cache[key] = (note_mod, chars)
+        return chars
+
+    @staticmethod
+    def _field_column(field_mode: str) -> str:
+        """Get the notes column to read for a field selection mode."""
+        # Anki keeps a copy of the sort field in notes.sfld, so read just that
+        # column instead of all fields when only the sort field is needed
+        # (sfld has integer affinity, so cast numeric sort fields back to text)
+        if field_mode == 'sortField':
+            return 'CAST(notes.sfld AS TEXT)'
+        return 'notes.flds'
+
+    def _get_hanzi_total_and_reviewed(self, deck_ids: List[int], field_mode: str) -> Tuple[Set[str], Set[str]]:
         """
-        Extract Hanzi characters from cards in specified decks.
+        Extract Hanzi from all cards and from reviewed cards with a single scan.
 
         Args:
             deck_ids: List of deck IDs to query (None for all decks)
-            include_new: Whether to include new/unseen cards
             field_mode: Which fields to extract from ('all', 'sortField', or field number)
 
         Returns:
-            Set of unique Hanzi characters found
+            Tuple of (Hanzi in all cards, Hanzi in reviewed cards)
         """
-        hanzi_set = set()
-
-        # Build SQL query
-        if include_new:
-            # Include all cards (queue >= 0, excluding suspended/buried)
-            if deck_ids is None:
-                query = """
-                    SELECT DISTINCT notes.flds
-                    FROM cards
-                    INNER JOIN notes ON cards.nid = notes.id
-                    WHERE cards.queue >= 0
-                """
-                params = []
-            else:
-                placeholders = ','.join('?' * len(deck_ids))
-                query = f"""
-                    SELECT DISTINCT notes.flds
-                    FROM cards
-                    INNER JOIN notes ON cards.nid = notes.id
-                    WHERE cards.did IN ({placeholders})
-                      AND cards.queue >= 0
-                """
-                params = list(deck_ids)
+        total_hanzi = set()
+        reviewed_hanzi = set()
+
+        column = self._field_column(field_mode)
+
+        # A note counts as reviewed if any of its cards is out of the new
+        # queue and has a review log entry
+        if deck_ids is None:
+            deck_filter = ""
+            params = []
         else:
-            # Only reviewed cards (must have entry in revlog)
-            if deck_ids is None:
-                query = """
-                    SELECT DISTINCT notes.flds
-                    FROM cards
-                    INNER JOIN notes ON cards.nid = notes.id
-                    INNER JOIN revlog ON cards.id = revlog.cid
-                    WHERE cards.queue > 0
-                """
-                params = []
-            else:
-                placeholders = ','.join('?' * len(deck_ids))
-                query = f"""
-                    SELECT DISTINCT notes.flds
-                    FROM cards
-                    INNER JOIN notes ON cards.nid = notes.id
-                    INNER JOIN revlog ON cards.id = revlog.cid
-                    WHERE cards.did IN ({placeholders})
-                      AND cards.queue > 0
-                """
-                params = list(deck_ids)
-
-        # Execute query and extract Hanzi
-        try:
-            row_count = 0
-            for row in self.col.db.execute(query, *params):
-                row_count += 1
-                fields_str = row[0]
-                # Split fields by field separator (\x1F)
-                fields = fields_str.split('\x1f')
-                # Extract Hanzi based on field mode
-                chars = HanziDetector.extract_from_fields(fields, field_mode)
-                hanzi_set.update(chars)
-
-            print(f"DEBUG: Processed {row_count} notes, found {len(hanzi_set)} unique Hanzi")
-            print(f"DEBUG: Field mode = {field_mode}")
-            if row_count > 0 and len(hanzi_set) > 0:
-                print(f"DEBUG: Sample Hanzi: {list(hanzi_set)[:10]}")
-        except Exception as e:
-            print(f"Error querying database: {e}")
-            import traceback
-            traceback.print_exc()
-
-        return hanzi_set
+            deck_filter = f"cards.did IN ({','.join('?' * len(deck_ids))}) AND"
+            params = list(deck_ids)
+
+        query = f"""
+            SELECT notes.id, notes.mod, {column},
+                   MAX(cards.queue > 0 AND EXISTS (SELECT 1 FROM revlog WHERE revlog.cid = cards.id))
+            FROM cards
+            INNER JOIN notes ON cards.nid = notes.id
+            WHERE {deck_filter} cards.queue >= 0
+            GROUP BY notes.id
+        """
+
+        # Query errors propagate, so callers never mistake a failed query for
+        # an empty deck (and cache it as one)
+        for note_id, note_mod, fields_str, reviewed in self.col.db.execute(query, *params):
+            chars = self._get_note_hanzi(note_id, note_mod, fields_str, field_mode)
+            total_hanzi.update(chars)
+            if reviewed:
+                reviewed_hanzi.update(chars)
+
+        return total_hanzi, reviewed_hanzi
 
     def get_deck_list(self) -> List[Tuple[int, str]]:
         """
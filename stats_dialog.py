@@ -2,17 +2,664 @@
 Statistics dialog UI for Hanzi Deck Statistics addon.
 """
 
-from typing import List, Dict
-
-from aqt import mw
+import functools
+import html as html_module
+import json
+import re
+from collections import OrderedDict
+from typing import List, Dict, Set, Tuple
+
+from aqt import mw, gui_hooks
 from aqt.qt import (
     QDialog, QVBoxLayout, QHBoxLayout, QComboBox,
-    QCheckBox, QPushButton, QLabel, QWidget, QScrollArea, QFrame, QGroupBox
+    QCheckBox, QPushButton, QLabel, QWidget, QScrollArea, QFrame, QGroupBox, QTimer
 )
 from aqt.webview import AnkiWebView
 
 from .stats_calculator import StatsCalculator, DeckStatistics
 
+# Delay after the last selection change before statistics are recalculated
+REFRESH_DELAY_MS = 150
+
+# Shown for decks whose note type can't be determined
+_GENERIC_FIELD_NAMES = ("1st Field", "2nd Field", "3rd Field", "4th Field", "5th Field")
+
+# How long a calculation may run before the progress indicator is shown
+PROGRESS_DELAY_MS = 200
+
+# Number of calculated selections (stats and HTML) kept for instant re-display
+STATS_CACHE_SIZE = 8
+
+
+# Qt stylesheets for the deck selection controls
+_CONTROLS_STYLESHEET = """
+    QWidget {
+        background-color: #f5f5f5;
+    }
+    QLabel {
+        color: #333333;
+        font-weight: bold;
+    }
+    QPushButton {
+        background-color: #1976d2;
+        color: white;
+        border: none;
+        padding: 6px 16px;
+        border-radius: 3px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #1565c0;
+    }
+    QCheckBox {
+        color: #333333;
+    }
+    QGroupBox {
+        background-color: white;
+        border: 1px solid #cccccc;
+        border-radius: 4px;
+        margin-top: 8px;
+        padding-top: 10px;
+    }
+    QGroupBox::title {
+        color: #1976d2;
+        font-weight: bold;
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px;
+    }
+"""
+
+_DECK_WIDGET_STYLESHEET = """
+    QWidget {
+        background-color: white;
+        border: 1px solid #cccccc;
+        border-radius: 4px;
+        padding: 6px;
+    }
+"""
+
+_DECK_CHECKBOX_STYLESHEET = """
+    QCheckBox::indicator {
+        width: 16px;
+        height: 16px;
+    }
+"""
+
+
+_INDENTATION_RE = re.compile(r'\n\s+')
+_STYLE_BLOCK_RE = re.compile(r'(<style>)(.*?)(</style>)', re.DOTALL)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE_RE = re.compile(r'\s*([{};:,>])\s*')
+_JS_LINE_COMMENT_RE = re.compile(r'^//.*\n', re.MULTILINE)
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->\n?', re.DOTALL)
+
+
+def _strip_indentation(markup: str) -> str:
+    """Drop the source indentation and blank lines from an HTML/CSS/JS fragment."""
+    return _INDENTATION_RE.sub('\n', markup).strip()
+
+
+def _minify_css(css: str) -> str:
+    """Drop comments and the whitespace around CSS punctuation."""
+    css = _CSS_COMMENT_RE.sub('', css)
+    return _CSS_SPACE_RE.sub(r'\1', ' '.join(css.split()))
+
+
+def _minify_head(markup: str) -> str:
+    """Minify the page head: compact CSS, and strip comments from the script and markup."""
+    markup = _strip_indentation(markup)
+    markup = _STYLE_BLOCK_RE.sub(lambda m: m.group(1) + _minify_css(m.group(2)) + m.group(3), markup)
+    # Whole-line comments only (the script keeps its line breaks, so this is safe)
+    markup = _JS_LINE_COMMENT_RE.sub('', markup)
+    return _HTML_COMMENT_RE.sub('', markup)
+
+
+# Static report fragments, formatted with str.format for each deck/row
+_SUMMARY_TABLE_TEMPLATE = """
+        <table class="summary-table">
+            <tr>
+                <th>Metric</th>
+                <th>Count</th>
+                <th>Percentage</th>
+                <th>Progress</th>
+            </tr>
+            <tr>
+                <td><strong>Total Hanzi</strong></td>
+                <td>{total_count}</td>
+                <td>100%</td>
+                <td>
+                    <div class="progress">
+                        <div class="progress-bar" style="width: 100%"></div>
+                    </div>
+                </td>
+            </tr>
+            <tr>
+                <td><strong>Reviewed Hanzi</strong></td>
+                <td>{reviewed_count}</td>
+                <td>{reviewed_pct:.1f}%</td>
+                <td>
+                    <div class="progress">
+                        <div class="progress-bar progress-bar-reviewed" style="width: {reviewed_pct}%"></div>
+                    </div>
+                </td>
+            </tr>
+        </table>"""
+
+_CATEGORY_TABLE_HEADER = """
+        <table class="category-table">
+            <tr>
+                <th>Category</th>
+                <th class="tooltip-header" data-tooltip="Total unique Hanzi in this category found in your deck">In Deck ℹ️</th>
+                <th class="tooltip-header" data-tooltip="Hanzi you've reviewed at least once">Reviewed ℹ️</th>
+        """
+
+_OFFICIAL_COLUMN_HEADER = '<th class="tooltip-header" data-tooltip="Total Hanzi in official HSK list for this category">Official ℹ️</th>'
+
+_CATEGORY_TABLE_HEADER_END = """
+                <th>Progress</th>
+            </tr>
+        """
+
+# One category row; the Official cell is only present for HSK tables
+_CATEGORY_ROW_TEMPLATE = (
+    '<tr class="clickable-row" data-type="{category_type}" data-category="{category_attr}" '
+    'title="Click to see character details">'
+    '<td>{category_name}</td><td>{total_count}</td><td>{reviewed_count}</td>{official_cell}'
+    '<td><div class="progress"><div class="progress-bar progress-bar-category" style="width: {pct}%"></div></div></td>'
+    '</tr>\n'
+)
+
+_OFFICIAL_COLUMN_TEMPLATE = "<td>{official_count}</td>"
+
+# Character details modal styles, injected on first opening since most
+# reports are read without ever opening the modal
+_MODAL_CSS = _minify_css("""
+    .modal {
+        position: fixed;
+        z-index: 1000;
+        left: 0;
+        top: 0;
+        width: 100%;
+        height: 100%;
+        overflow: auto;
+        background-color: rgba(0,0,0,0.5);
+    }
+    .modal-content {
+        background-color: #fefefe;
+        margin: 5% auto;
+        padding: 0;
+        border: 1px solid #888;
+        border-radius: 8px;
+        width: 80%;
+        max-width: 800px;
+        max-height: 80vh;
+        display: flex;
+        flex-direction: column;
+        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
+    }
+    .modal-header {
+        padding: 20px;
+        background-color: #1976d2;
+        color: white;
+        border-radius: 8px 8px 0 0;
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+    }
+    .modal-header h2 {
+        margin: 0;
+        color: white;
+        border: none;
+        padding: 0;
+    }
+    .modal-body {
+        padding: 20px;
+        overflow-y: auto;
+        flex: 1;
+    }
+    .close {
+        color: white;
+        font-size: 32px;
+        font-weight: bold;
+        cursor: pointer;
+        line-height: 1;
+        padding: 0 10px;
+    }
+    .close:hover {
+        opacity: 0.7;
+    }
+    .char-section {
+        margin-bottom: 25px;
+        content-visibility: auto;
+        contain-intrinsic-size: auto 200px;
+    }
+    .char-section h3 {
+        color: #424242;
+        margin-top: 0;
+        margin-bottom: 12px;
+        padding-bottom: 8px;
+        border-bottom: 2px solid #e0e0e0;
+    }
+    .char-list {
+        font-size: 28px;
+        line-height: 1.8;
+        display: grid;
+        grid-template-columns: repeat(auto-fill, 36px);
+        gap: 4px;
+        justify-content: start;
+        padding: 15px;
+        background-color: #f5f5f5;
+        border-radius: 4px;
+        contain: layout style paint;
+    }
+    .char-list span {
+        text-align: center;
+    }
+    .modal.loading .char-list {
+        visibility: hidden;
+    }
+    .char-list.is-empty span {
+        grid-column: 1 / -1;
+        text-align: left;
+    }
+    .reviewed-section .char-list {
+        background-color: #e8f5e9;
+    }
+    .missing-section .char-list {
+        background-color: #ffebee;
+    }
+    .not-in-deck-section .char-list {
+        background-color: #fff3e0;
+    }
+    .char-count {
+        font-size: 14px;
+        color: #666;
+        margin-top: 8px;
+        font-style: italic;
+    }
+""")
+
+# Page head (styles and scripts) and the character details modal
+_HTML_HEADER = """
+        <html>
+        <head>
+            <style>
+                body {
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                    padding: 20px;
+                    color: #333;
+                    background-color: #fafafa;
+                }
+                h1 {
+                    color: #1976d2;
+                    border-bottom: 3px solid #1976d2;
+                    padding-bottom: 10px;
+                }
+                h2 {
+                    color: #424242;
+                    border-bottom: 2px solid #e0e0e0;
+                    padding-bottom: 8px;
+                    margin-top: 30px;
+                }
+                h3 {
+                    color: #616161;
+                    margin-top: 25px;
+                }
+                h4 {
+                    color: #757575;
+                    margin-top: 20px;
+                    margin-bottom: 10px;
+                }
+                table {
+                    border-collapse: collapse;
+                    width: 100%;
+                    background-color: white;
+                    box-shadow: 0 1px 3px rgba(0,0,0,0.12);
+                    border-radius: 4px;
+                    margin-bottom: 20px;
+                }
+                th, td {
+                    padding: 12px 16px;
+                    text-align: left;
+                }
+                th {
+                    background-color: #f5f5f5;
+                    font-weight: 600;
+                    color: #424242;
+                    border-bottom: 2px solid #e0e0e0;
+                }
+                .tooltip-header {
+                    position: relative;
+                    cursor: help;
+                }
+                .tooltip-header:hover::after {
+                    content: attr(data-tooltip);
+                    position: absolute;
+                    bottom: 100%;
+                    left: 50%;
+                    transform: translateX(-50%);
+                    background-color: #333;
+                    color: white;
+                    padding: 8px 12px;
+                    border-radius: 4px;
+                    white-space: nowrap;
+                    font-size: 12px;
+                    font-weight: normal;
+                    z-index: 100;
+                    margin-bottom: 5px;
+                    box-shadow: 0 2px 8px rgba(0,0,0,0.3);
+                }
+                .tooltip-header:hover::before {
+                    content: '';
+                    position: absolute;
+                    bottom: 100%;
+                    left: 50%;
+                    transform: translateX(-50%);
+                    border: 5px solid transparent;
+                    border-top-color: #333;
+                    z-index: 100;
+                }
+                td {
+                    border-bottom: 1px solid #f0f0f0;
+                }
+                tr:last-child td {
+                    border-bottom: none;
+                }
+                tr:hover {
+                    background-color: #fafafa;
+                }
+                .summary-table {
+                    font-size: 1.1em;
+                }
+                .category-table {
+                    font-size: 0.95em;
+                    margin-left: 20px;
+                }
+                .clickable-row {
+                    cursor: pointer;
+                    transition: background-color 0.2s;
+                }
+                .clickable-row:hover {
+                    background-color: #e3f2fd !important;
+                }
+                .progress {
+                    background-color: #e0e0e0;
+                    height: 24px;
+                    border-radius: 12px;
+                    overflow: hidden;
+                    min-width: 100px;
+                }
+                .progress-bar {
+                    --bar-start: #4CAF50;
+                    --bar-end: #45a049;
+                    background: linear-gradient(90deg, var(--bar-start) 0%, var(--bar-end) 100%);
+                    height: 100%;
+                    display: flex;
+                    align-items: center;
+                    justify-content: center;
+                    color: white;
+                    font-size: 0.85em;
+                    font-weight: 500;
+                }
+                .progress-bar-reviewed {
+                    --bar-start: #2196F3;
+                    --bar-end: #1976D2;
+                }
+                .progress-bar-category {
+                    --bar-start: #FF9800;
+                    --bar-end: #F57C00;
+                }
+
+                /* The modal stays hidden until its own styles are loaded */
+                .modal {
+                    display: none;
+                }
+            </style>
+            <script>
+                var MODAL_CSS = __MODAL_CSS__;
+
+                // Character lists already received for the current report, by "type:category"
+                var charDataCache = {};
+
+                var modalStylesLoaded = false;
+
+                function loadModalStyles() {
+                    if (!modalStylesLoaded) {
+                        var style = document.createElement('style');
+                        style.textContent = MODAL_CSS;
+                        document.head.appendChild(style);
+                        modalStylesLoaded = true;
+                    }
+                }
+
+                function showCharacterDetails(row) {
+                    loadModalStyles();
+                    var key = row.dataset.type + ':' + row.dataset.category;
+                    if (charDataCache[key]) {
+                        fillCharacterDetails(charDataCache[key]);
+                    } else {
+                        // Ask Python for the character lists; it calls fillCharacterDetails
+                        pycmd('hanziChars:' + key);
+                    }
+                }
+
+                // Modal elements, created from their template on first use (the
+                // modal is never replaced)
+                var modalElements = null;
+
+                function getModalElements() {
+                    if (!modalElements) {
+                        var template = document.getElementById('charModalTemplate');
+                        document.body.appendChild(template.content.cloneNode(true));
+                        template.remove();
+
+                        modalElements = {};
+                        ['charModal', 'modalTitle', 'reviewedChars', 'missingChars', 'notInDeckChars',
+                         'reviewedCount', 'missingCount', 'notInDeckCount', 'notInDeckSection'].forEach(function(id) {
+                            modalElements[id] = document.getElementById(id);
+                        });
+
+                        // Close the modal when its backdrop (not its content) is clicked
+                        var modal = modalElements.charModal;
+                        modal.addEventListener('click', function(event) {
+                            if (event.target == modal) {
+                                closeModal();
+                            }
+                        });
+                    }
+                    return modalElements;
+                }
+
+                // Long lists are shown a chunk at a time so the modal opens immediately
+                var CHAR_CHUNK_SIZE = 500;
+                var renderGeneration = 0;
+                var scheduleIdle = window.requestIdleCallback || function(callback) { setTimeout(callback, 0); };
+
+                // Each character is its own grid cell. Cells left from the last
+                // opening are reused by swapping their text; only missing cells are
+                // created, off-document, and inserted at once.
+                function fillCharCells(node, chars, start) {
+                    var cells = node.children;
+                    var frag = null;
+                    for (var i = 0; i < chars.length; i++) {
+                        var cell = cells[start + i];
+                        if (cell) {
+                            cell.firstChild.nodeValue = chars[i];
+                        } else {
+                            frag = frag || document.createDocumentFragment();
+                            cell = document.createElement('span');
+                            cell.appendChild(document.createTextNode(chars[i]));
+                            frag.appendChild(cell);
+                        }
+                    }
+                    if (frag) {
+                        node.appendChild(frag);
+                    }
+                }
+
+                function trimCharCells(node, length) {
+                    while (node.children.length > length) {
+                        node.lastElementChild.remove();
+                    }
+                }
+
+                function setCharList(node, list, count) {
+                    node.classList.toggle('is-empty', !list);
+                    if (!list) {
+                        trimCharCells(node, 1);
+                        fillCharCells(node, ['None'], 0);
+                        return;
+                    }
+
+                    // Split on the separators, so surrogate pairs are never cut
+                    var chars = list.split(' ');
+                    if (count <= CHAR_CHUNK_SIZE) {
+                        trimCharCells(node, chars.length);
+                        fillCharCells(node, chars, 0);
+                        return;
+                    }
+
+                    // Drop cells past the first chunk, so none show stale characters
+                    var generation = renderGeneration;
+                    var next = CHAR_CHUNK_SIZE;
+                    trimCharCells(node, next);
+                    fillCharCells(node, chars.slice(0, next), 0);
+
+                    function appendChunk() {
+                        if (generation !== renderGeneration) {
+                            return;  // Modal closed or showing another category
+                        }
+                        fillCharCells(node, chars.slice(next, next + CHAR_CHUNK_SIZE), next);
+                        next += CHAR_CHUNK_SIZE;
+                        if (next < chars.length) {
+                            scheduleIdle(appendChunk);
+                        }
+                    }
+                    scheduleIdle(appendChunk);
+                }
+
+                // Runs callback once the current changes have been painted
+                function afterNextPaint(callback) {
+                    requestAnimationFrame(function() {
+                        setTimeout(callback, 0);
+                    });
+                }
+
+                function fillCharacterDetails(data) {
+                    charDataCache[data.key] = data;
+
+                    var el = getModalElements();
+
+                    // Abandon any lists still being rendered for a previous category
+                    renderGeneration++;
+                    var generation = renderGeneration;
+
+                    // Open the modal straight away with its title and counts; the
+                    // (possibly long) lists stay hidden until it has been painted
+                    el.modalTitle.textContent = data.category + ' - Character Details';
+                    el.reviewedCount.textContent = data.reviewedCount + ' characters';
+                    el.missingCount.textContent = data.missingCount + ' characters';
+
+                    // Show/hide "Not in Deck" section based on whether we have data
+                    if (data.notInDeckCount > 0) {
+                        el.notInDeckCount.textContent = data.notInDeckCount + ' characters';
+                        el.notInDeckSection.style.display = 'block';
+                    } else {
+                        el.notInDeckSection.style.display = 'none';
+                    }
+
+                    el.charModal.classList.add('loading');
+                    el.charModal.style.display = 'block';
+
+                    // Character lists arrive as space-separated strings, with their counts
+                    afterNextPaint(function() {
+                        if (generation !== renderGeneration) {
+                            return;  // Modal closed or showing another category
+                        }
+                        setCharList(el.reviewedChars, data.reviewed, data.reviewedCount);
+                        setCharList(el.missingChars, data.missing, data.missingCount);
+                        if (data.notInDeckCount > 0) {
+                            setCharList(el.notInDeckChars, data.notInDeck, data.notInDeckCount);
+                        }
+                        el.charModal.classList.remove('loading');
+                    });
+                }
+
+                function closeModal() {
+                    renderGeneration++;
+                    // Nothing to close if the modal hasn't been created yet
+                    if (modalElements) {
+                        modalElements.charModal.style.display = 'none';
+                    }
+                }
+
+                document.addEventListener('DOMContentLoaded', function() {
+                    // One listener serves every category row, including rows swapped in later
+                    var report = document.getElementById('report');
+                    if (report) {
+                        report.addEventListener('click', function(event) {
+                            var row = event.target.closest('tr.clickable-row');
+                            if (row) {
+                                showCharacterDetails(row);
+                            }
+                        });
+                    }
+                });
+            </script>
+        </head>
+        <body>
+            <!-- Modal, only added to the document when first opened -->
+            <template id="charModalTemplate">
+                <div id="charModal" class="modal">
+                    <div class="modal-content">
+                        <div class="modal-header">
+                            <h2 id="modalTitle">Character Details</h2>
+                            <span class="close" onclick="closeModal()">&times;</span>
+                        </div>
+                        <div class="modal-body">
+                            <div class="char-section reviewed-section">
+                                <h3>✓ Reviewed Characters</h3>
+                                <div class="char-list" id="reviewedChars"></div>
+                                <div class="char-count" id="reviewedCount"></div>
+                            </div>
+                            <div class="char-section missing-section">
+                                <h3>✗ Not Yet Reviewed</h3>
+                                <div class="char-list" id="missingChars"></div>
+                                <div class="char-count" id="missingCount"></div>
+                            </div>
+                            <div class="char-section not-in-deck-section" id="notInDeckSection">
+                                <h3>⊘ Not in Deck</h3>
+                                <div class="char-list" id="notInDeckChars"></div>
+                                <div class="char-count" id="notInDeckCount"></div>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+            </template>
+        """
+
+# Indentation is only there for readability here; don't send it to the webview
+_SUMMARY_TABLE_TEMPLATE = _strip_indentation(_SUMMARY_TABLE_TEMPLATE)
+_CATEGORY_TABLE_HEADER = _strip_indentation(_CATEGORY_TABLE_HEADER)
+_CATEGORY_TABLE_HEADER_END = _strip_indentation(_CATEGORY_TABLE_HEADER_END)
+_HTML_HEADER = _minify_head(_HTML_HEADER).replace('__MODAL_CSS__', json.dumps(_MODAL_CSS))
+
+_HTML_FOOTER = "</body></html>"
+
+# Wraps the report so later refreshes can swap it in place without reloading the page
+_REPORT_START = '<div id="report">'
+_REPORT_END = '</div>'
+
+# Complete page shown when nothing is selected
+_NO_SELECTION_HTML = _HTML_HEADER + """
+        <h1>Hanzi Deck Statistics</h1>
+        <p style="font-size: 1.2em; color: #666; margin-top: 50px; text-align: center;">
+            Please select at least one deck and one field to view statistics.
+        </p>
+        """ + _HTML_FOOTER
+_NO_SELECTION_HTML = _strip_indentation(_NO_SELECTION_HTML)
+
 
 class HanziStatsDialog(QDialog):
     """Dialog window for displaying Hanzi deck statistics."""
@@ -24,9 +671,11 @@ class HanziStatsDialog(QDialog):
 
         # Get config
         self.config = mw.addonManager.getConfig(__name__.split('.')[0])
+        self._load_display_options()
 
-        # Create calculator
-        self.calculator = StatsCalculator(mw.col, self.config)
+        # Create calculator with its own copy of the config, since it is used
+        # from background threads while the dialog updates and saves self.config
+        self.calculator = StatsCalculator(mw.col, dict(self.config))
 
         # Store deck selection data: {deck_id: {'name': str, 'checkbox': QCheckBox, 'fields': [QCheckBox], 'subdecks': [QCheckBox]}}
         self.deck_data: Dict[int, Dict] = {}
@@ -34,6 +683,52 @@ class HanziStatsDialog(QDialog):
         # Flag to prevent refreshes during UI setup
         self._is_loading = True
 
+        # Incremented per refresh so only the latest background result is shown
+        self._refresh_generation = 0
+
+        # Selection key -> (collection mod time, stats, report body HTML), most recently used last.
+        # Display options are fixed while the dialog is open, so they need not be in the key.
+        self._stats_cache: "OrderedDict[Tuple, Tuple[int, DeckStatistics, str]]" = OrderedDict()
+
+        # Drop cached reports as soon as the collection changes or syncs,
+        # rather than holding on to them until the mod time check misses
+        gui_hooks.operation_did_execute.append(self._on_collection_changed)
+        gui_hooks.sync_did_finish.append(self._on_collection_changed)
+        self.finished.connect(self._remove_hooks)
+
+        # Selections are written to the config once, when the dialog closes
+        self.finished.connect(self._save_selections)
+
+        # Coalesces bursts of checkbox changes into a single refresh
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_DELAY_MS)
+        self._refresh_timer.timeout.connect(self._do_refresh)
+
+        # (deck IDs, field) -> (collection mod time, all Hanzi, reviewed Hanzi),
+        # so toggling one field doesn't requery the others. Entries are only
+        # used for the collection state they were calculated from.
+        self._hanzi_cache: Dict[Tuple[Tuple[int, ...], str], Tuple[int, frozenset, frozenset]] = {}
+
+        # Deck ID -> field names of the deck's most common note type
+        self._field_names_cache: Dict[int, List[str]] = {}
+
+        # Progress is only shown once a calculation has been running for a while
+        self._pending_calculations = 0
+        self._progress_shown = False
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(PROGRESS_DELAY_MS)
+        self._progress_timer.timeout.connect(self._show_progress)
+
+        # Stats shown in the webview, used to answer character detail requests,
+        # and the serialized character details already built from them
+        self._displayed_stats = None
+        self._char_data_cache: Dict[Tuple[str, str], str] = {}
+
+        # Whether the webview holds the report page, so a new report body can be swapped in
+        self._report_page_loaded = False
+
         # Setup UI
         self._setup_ui()
 
@@ -41,7 +736,27 @@ class HanziStatsDialog(QDialog):
         self._is_loading = False
 
         # Load initial stats
-        self.refresh_stats()
+        self._do_refresh()
+
+    def _on_collection_changed(self, *args):
+        """Invalidate cached reports after the collection was modified."""
+        self._stats_cache.clear()
+        self._hanzi_cache.clear()
+        self._field_names_cache.clear()
+
+    def _remove_hooks(self):
+        """Unregister the collection change hooks when the dialog closes."""
+        gui_hooks.operation_did_execute.remove(self._on_collection_changed)
+        gui_hooks.sync_did_finish.remove(self._on_collection_changed)
+
+    def _load_display_options(self):
+        """Derive which report sections to show from the config."""
+        self._show_categories = self.config.get('showCategories', True)
+
+        categories_to_show = self.config.get('categoriesToShow', [])
+        self._show_hsk_2012 = any('HSK 2.0' in cat or 'Level' in cat for cat in categories_to_show)
+        self._show_hsk_2021 = any('HSK 3.0' in cat or 'Band' in cat for cat in categories_to_show)
+        self._show_frequency = any('Top' in cat for cat in categories_to_show)
 
     def _setup_ui(self):
         """Setup the dialog UI layout."""
@@ -55,6 +770,7 @@ class HanziStatsDialog(QDialog):
 
         # Stats display (HTML)
         self.webview = AnkiWebView(parent=self)
+        self.webview.set_bridge_command(self._on_bridge_cmd, self)
         layout.addWidget(self.webview, stretch=1)
 
         self.setLayout(layout)
@@ -62,43 +778,7 @@ class HanziStatsDialog(QDialog):
     def _create_controls(self) -> QWidget:
         """Create the control panel at the top of the dialog."""
         controls_widget = QWidget()
-        controls_widget.setStyleSheet("""
-            QWidget {
-                background-color: #f5f5f5;
-            }
-            QLabel {
-                color: #333333;
-                font-weight: bold;
-            }
-            QPushButton {
-                background-color: #1976d2;
-                color: white;
-                border: none;
-                padding: 6px 16px;
-                border-radius: 3px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1565c0;
-            }
-            QCheckBox {
-                color: #333333;
-            }
-            QGroupBox {
-                background-color: white;
-                border: 1px solid #cccccc;
-                border-radius: 4px;
-                margin-top: 8px;
-                padding-top: 10px;
-            }
-            QGroupBox::title {
-                color: #1976d2;
-                font-weight: bold;
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-            }
-        """)
+        controls_widget.setStyleSheet(_CONTROLS_STYLESHEET)
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(10, 10, 10, 10)
@@ -131,6 +811,12 @@ class HanziStatsDialog(QDialog):
         """Populate deck checkboxes with field and subdeck options."""
         deck_list = self.calculator.get_deck_list()
 
+        # Index all subdecks (at any depth) under their top-level deck name
+        subdecks_by_top_level: Dict[str, List[Tuple[int, str]]] = {}
+        for sub_id, sub_name in deck_list:
+            if "::" in sub_name:
+                subdecks_by_top_level.setdefault(sub_name.split("::", 1)[0], []).append((sub_id, sub_name))
+
         # Skip "All Decks" entry (deck_id == 0)
         for deck_id, deck_name in deck_list:
             if deck_id == 0:  # Skip "All Decks"
@@ -142,14 +828,7 @@ class HanziStatsDialog(QDialog):
 
             # Create container widget for this deck
             deck_widget = QWidget()
-            deck_widget.setStyleSheet("""
-                QWidget {
-                    background-color: white;
-                    border: 1px solid #cccccc;
-                    border-radius: 4px;
-                    padding: 6px;
-                }
-            """)
+            deck_widget.setStyleSheet(_DECK_WIDGET_STYLESHEET)
             deck_layout = QVBoxLayout()
             deck_layout.setContentsMargins(6, 6, 6, 6)
             deck_layout.setSpacing(8)
@@ -160,14 +839,8 @@ class HanziStatsDialog(QDialog):
             # Load saved state from config
             saved_decks = self.config.get('selectedDecks', {})
             deck_cb.setChecked(saved_decks.get(str(deck_id), {}).get('selected', False))
-            deck_cb.setStyleSheet("""
-                QCheckBox::indicator {
-                    width: 16px;
-                    height: 16px;
-                }
-            """)
-            deck_cb.stateChanged.connect(lambda state, did=deck_id: self._on_deck_toggled(did, state))
-            deck_cb.stateChanged.connect(self.refresh_stats)
+            deck_cb.setStyleSheet(_DECK_CHECKBOX_STYLESHEET)
+            deck_cb.toggled.connect(functools.partial(self._on_deck_toggled, deck_id))
 
             deck_label = QLabel(deck_name)
             deck_label.setStyleSheet("font-weight: bold; font-size: 11px; color: #1976d2;")
@@ -177,86 +850,107 @@ class HanziStatsDialog(QDialog):
             header_row.addStretch()
             deck_layout.addLayout(header_row)
 
-            # Options container (hidden by default)
-            options_widget = QWidget()
-            options_layout = QVBoxLayout()
-            options_layout.setContentsMargins(25, 0, 0, 0)
-            options_layout.setSpacing(6)
-
-            # Field selection checkboxes
-            fields_label = QLabel("Fields to include:")
-            fields_label.setStyleSheet("font-weight: bold; font-size: 9px; color: #666;")
-            options_layout.addWidget(fields_label)
-
-            # Get field names for this deck
-            field_names = self._get_field_names_for_deck(deck_id)
-
-            field_options = [
-                ("all", "All Fields"),
-                ("sortField", "Sort Field Only"),
-            ]
-
-            # Add individual field options with actual names
-            for i, field_name in enumerate(field_names[:5], 1):  # Limit to first 5 fields
-                field_options.append((str(i), field_name))
-
-            field_checkboxes = []
-            saved_fields = saved_decks.get(str(deck_id), {}).get('fields', ['all'])
-            for field_value, field_label in field_options:
-                field_cb = QCheckBox(field_label)
-                field_cb.setStyleSheet("margin-left: 8px; font-size: 9px;")
-                # Check if this field was previously selected
-                field_cb.setChecked(field_value in saved_fields)
-                field_cb.stateChanged.connect(self.refresh_stats)
-                options_layout.addWidget(field_cb)
-                field_checkboxes.append((field_value, field_cb))
-
-            # Subdeck selection checkboxes
-            subdeck_checkboxes = []
-            saved_subdecks = saved_decks.get(str(deck_id), {}).get('subdecks', [])
-            # Get subdecks for this deck
-            subdecks_exist = False
-            for sub_id, sub_name in deck_list:
-                if sub_name.startswith(deck_name + "::"):
-                    if not subdecks_exist:
-                        # Add label for subdecks
-                        subdecks_label = QLabel("Subdecks to include:")
-                        subdecks_label.setStyleSheet("font-weight: bold; font-size: 9px; color: #666; margin-top: 6px;")
-                        options_layout.addWidget(subdecks_label)
-                        subdecks_exist = True
-
-                    subdeck_cb = QCheckBox(sub_name.split("::")[-1])  # Just show the last part
-                    subdeck_cb.setStyleSheet("margin-left: 8px; font-size: 9px;")
-                    # Restore saved state, default to True if not saved yet
-                    if saved_subdecks:
-                        subdeck_cb.setChecked(sub_id in saved_subdecks)
-                    else:
-                        subdeck_cb.setChecked(True)  # Default to including subdecks
-                    subdeck_cb.stateChanged.connect(self.refresh_stats)
-                    options_layout.addWidget(subdeck_cb)
-                    subdeck_checkboxes.append((sub_id, sub_name, subdeck_cb))
-
-            options_widget.setLayout(options_layout)
-            # Show options if deck was previously selected
-            options_widget.setVisible(deck_cb.isChecked())
-            deck_layout.addWidget(options_widget)
-
             deck_widget.setLayout(deck_layout)
             layout.addWidget(deck_widget)
 
-            # Store deck data
+            # Store deck data. The field/subdeck options are built the first
+            # time the deck is checked, so unselected decks cost only a header.
             self.deck_data[deck_id] = {
                 'name': deck_name,
                 'checkbox': deck_cb,
-                'fields': field_checkboxes,
-                'subdecks': subdeck_checkboxes,
-                'options_widget': options_widget
+                'fields': [],
+                'subdecks': [],
+                'options_widget': None,
+                'layout': deck_layout,
+                'subdeck_list': subdecks_by_top_level.get(deck_name, [])
             }
 
+            # Show options if deck was previously selected
+            if deck_cb.isChecked():
+                self._build_deck_options(deck_id)
+
         layout.addStretch()
 
+    def _build_deck_options(self, deck_id: int):
+        """Create the field and subdeck checkboxes of a deck and add them below its header."""
+        deck_info = self.deck_data[deck_id]
+        saved_deck = self.config.get('selectedDecks', {}).get(str(deck_id), {})
+
+        # Options container
+        options_widget = QWidget()
+        options_layout = QVBoxLayout()
+        options_layout.setContentsMargins(25, 0, 0, 0)
+        options_layout.setSpacing(6)
+
+        # Field selection checkboxes
+        fields_label = QLabel("Fields to include:")
+        fields_label.setStyleSheet("font-weight: bold; font-size: 9px; color: #666;")
+        options_layout.addWidget(fields_label)
+
+        # Get field names for this deck
+        field_names = self._get_field_names_for_deck(deck_id)
+
+        field_options = [
+            ("all", "All Fields"),
+            ("sortField", "Sort Field Only"),
+        ]
+
+        # Add individual field options with actual names
+        for i, field_name in enumerate(field_names[:5], 1):  # Limit to first 5 fields
+            field_options.append((str(i), field_name))
+
+        field_checkboxes = []
+        saved_fields = saved_deck.get('fields', ['all'])
+        for field_value, field_label in field_options:
+            field_cb = QCheckBox(field_label)
+            field_cb.setStyleSheet("margin-left: 8px; font-size: 9px;")
+            # Check if this field was previously selected
+            field_cb.setChecked(field_value in saved_fields)
+            field_cb.toggled.connect(self.refresh_stats)
+            options_layout.addWidget(field_cb)
+            field_checkboxes.append((field_value, field_cb))
+
+        # Subdeck selection checkboxes
+        subdeck_checkboxes = []
+        saved_subdecks = saved_deck.get('subdecks', [])
+        # Get subdecks for this deck
+        subdecks_exist = False
+        for sub_id, sub_name in deck_info['subdeck_list']:
+            if not subdecks_exist:
+                # Add label for subdecks
+                subdecks_label = QLabel("Subdecks to include:")
+                subdecks_label.setStyleSheet("font-weight: bold; font-size: 9px; color: #666; margin-top: 6px;")
+                options_layout.addWidget(subdecks_label)
+                subdecks_exist = True
+
+            subdeck_cb = QCheckBox(sub_name.split("::")[-1])  # Just show the last part
+            subdeck_cb.setStyleSheet("margin-left: 8px; font-size: 9px;")
+            # Restore saved state, default to True if not saved yet
+            if saved_subdecks:
+                subdeck_cb.setChecked(sub_id in saved_subdecks)
+            else:
+                subdeck_cb.setChecked(True)  # Default to including subdecks
+            subdeck_cb.toggled.connect(self.refresh_stats)
+            options_layout.addWidget(subdeck_cb)
+            subdeck_checkboxes.append((sub_id, sub_name, subdeck_cb))
+
+        options_widget.setLayout(options_layout)
+        deck_info['layout'].addWidget(options_widget)
+
+        deck_info['fields'] = field_checkboxes
+        deck_info['subdecks'] = subdeck_checkboxes
+        deck_info['options_widget'] = options_widget
+
     def _get_field_names_for_deck(self, deck_id: int) -> List[str]:
         """Get field names from the most common note type in a deck."""
+        field_names = self._field_names_cache.get(deck_id)
+        if field_names is None:
+            field_names = self._query_field_names_for_deck(deck_id)
+            self._field_names_cache[deck_id] = field_names
+        return field_names
+
+    def _query_field_names_for_deck(self, deck_id: int) -> List[str]:
+        """Look up field names from the most common note type in a deck."""
         try:
             # Get deck and its subdecks
             deck_ids = mw.col.decks.deck_and_child_ids(deck_id)
@@ -286,22 +980,38 @@ class HanziStatsDialog(QDialog):
             traceback.print_exc()
 
         # Fallback to generic names
-        return ["1st Field", "2nd Field", "3rd Field", "4th Field", "5th Field"]
+        return list(_GENERIC_FIELD_NAMES)
 
-    def _on_deck_toggled(self, deck_id: int, state: int):
-        """Handle deck checkbox toggle - show/hide field and subdeck options."""
-        is_checked = state == 2  # Qt.Checked == 2
+    def _on_deck_toggled(self, deck_id: int, checked: bool):
+        """Handle deck checkbox toggle - show/hide field and subdeck options, then refresh."""
         deck_info = self.deck_data.get(deck_id)
 
         if deck_info:
-            # Show/hide the options widget
-            deck_info['options_widget'].setVisible(is_checked)
+            # Show/hide the options widget, building it on first use
+            if deck_info['options_widget'] is None:
+                if checked:
+                    self._build_deck_options(deck_id)
+            else:
+                deck_info['options_widget'].setVisible(checked)
+
+        self.refresh_stats()
 
     def _save_selections(self):
         """Save current deck/field/subdeck selections to config."""
+        saved_decks = self.config.get('selectedDecks', {})
         selected_decks = {}
 
         for deck_id, deck_info in self.deck_data.items():
+            if deck_info['options_widget'] is None:
+                # Options never shown; keep the previously saved choices
+                saved_deck = saved_decks.get(str(deck_id), {})
+                selected_decks[str(deck_id)] = {
+                    'selected': deck_info['checkbox'].isChecked(),
+                    'fields': saved_deck.get('fields', ['all']),
+                    'subdecks': saved_deck.get('subdecks', [])
+                }
+                continue
+
             # Get selected fields
             selected_fields = []
             for field_value, field_cb in deck_info['fields']:
@@ -326,702 +1036,355 @@ class HanziStatsDialog(QDialog):
         mw.addonManager.writeConfig(__name__.split('.')[0], self.config)
 
     def refresh_stats(self):
-        """Recalculate and display statistics."""
+        """Schedule a statistics refresh, restarting the delay on every call."""
         # Skip refresh during UI setup
         if self._is_loading:
             return
 
-        # Save current selections to config
-        self._save_selections()
+        self._refresh_timer.start()
 
-        # Show progress indicator
-        mw.progress.start(label="Calculating Hanzi statistics...")
+    def _do_refresh(self):
+        """Recalculate and display statistics."""
+        # Collect all selected decks and their settings (reads widgets, so on the UI thread)
+        selected_deck_configs = self._get_selected_deck_configs()
+
+        # Results of superseded refreshes are discarded when they arrive,
+        # including those superseded by the no-selection page
+        self._refresh_generation += 1
+        generation = self._refresh_generation
+
+        if len(selected_deck_configs) == 0:
+            self._set_displayed_stats(None)
+            self._report_page_loaded = False
+            self.webview.stdHtml(self._generate_no_selection_html())
+            return
 
-        try:
-            # Collect all selected decks and their settings
-            selected_deck_configs = []
-
-            for deck_id, deck_info in self.deck_data.items():
-                if not deck_info['checkbox'].isChecked():
-                    continue  # Skip unselected decks
-
-                # Get selected fields for this deck
-                selected_fields = []
-                for field_value, field_cb in deck_info['fields']:
-                    if field_cb.isChecked():
-                        selected_fields.append(field_value)
-
-                # If no fields selected, skip this deck
-                if not selected_fields:
-                    continue
-
-                # Get selected subdecks
-                selected_subdeck_ids = [deck_id]  # Always include the main deck
-                for sub_id, sub_name, subdeck_cb in deck_info['subdecks']:
-                    if subdeck_cb.isChecked():
-                        selected_subdeck_ids.append(sub_id)
-
-                selected_deck_configs.append({
-                    'deck_id': deck_id,
-                    'deck_name': deck_info['name'],
-                    'subdeck_ids': selected_subdeck_ids,
-                    'fields': selected_fields
-                })
-
-            # Generate HTML
-            if len(selected_deck_configs) == 0:
-                html = self._generate_no_selection_html()
-            else:
-                # Calculate combined stats for all selected decks
-                combined_stats = self._calculate_combined_stats(selected_deck_configs)
-                html = self._generate_single_deck_html(combined_stats)
+        # Reuse the report for this selection if the collection hasn't changed since
+        cache_key = self._get_stats_cache_key(selected_deck_configs)
+        mod = mw.col.mod
+        cached = self._stats_cache.get(cache_key)
+        if cached is not None and cached[0] == mod:
+            self._stats_cache.move_to_end(cache_key)
+            self._set_displayed_stats(cached[1])
+            self._show_report(cached[2])
+            return
 
-            # Display HTML
-            self.webview.stdHtml(html)
+        # Show progress indicator if the calculation turns out to be slow
+        self._pending_calculations += 1
+        if not self._progress_shown:
+            self._progress_timer.start()
 
-        except Exception as e:
-            error_html = f"""
-            <html>
-            <body style="font-family: sans-serif; padding: 20px;">
-                <h1 style="color: #d32f2f;">Error</h1>
-                <p>An error occurred while calculating statistics:</p>
-                <pre style="background-color: #f5f5f5; padding: 10px; border-radius: 5px;">{str(e)}</pre>
-            </body>
-            </html>
-            """
-            self.webview.stdHtml(error_html)
-            print(f"Error in refresh_stats: {e}")
-            import traceback
-            traceback.print_exc()
+        # Calculate combined stats for all selected decks off the UI thread
+        mw.taskman.run_in_background(
+            lambda: self._calculate_combined_stats(selected_deck_configs, mod),
+            lambda future: self._on_stats_ready(future, generation, cache_key, mod),
+        )
 
-        finally:
+    def _show_progress(self):
+        """Show the progress indicator for a calculation that is still running."""
+        mw.progress.start(label="Calculating Hanzi statistics...")
+        self._progress_shown = True
+
+    def _hide_progress(self):
+        """Cancel or close the progress indicator once no calculations are running."""
+        self._progress_timer.stop()
+        if self._progress_shown:
             mw.progress.finish()
+            self._progress_shown = False
+
+    @staticmethod
+    def _get_stats_cache_key(deck_configs: List[Dict]) -> Tuple:
+        """Build a hashable key identifying a deck/field/subdeck selection."""
+        return tuple(
+            (config['deck_id'], tuple(config['subdeck_ids']), tuple(config['fields']))
+            for config in deck_configs
+        )
+
+    def _on_stats_ready(self, future, generation: int, cache_key: Tuple, mod: int):
+        """Render, cache and display stats calculated in the background (on the UI thread)."""
+        self._pending_calculations -= 1
+        if self._pending_calculations == 0:
+            self._hide_progress()
+
+        if generation != self._refresh_generation:
+            return
 
-    def _calculate_combined_stats(self, deck_configs: List[Dict]):
-        """Calculate combined statistics from multiple decks."""
-        from .stats_calculator import DeckStatistics
+        try:
+            combined_stats = future.result()
+            html = self._generate_single_deck_body(combined_stats)
+        except Exception as e:
+            self._show_error(e)
+            return
 
-        # Build display name from all selected decks
-        deck_names = [config['deck_name'] for config in deck_configs]
-        if len(deck_names) == 1:
-            display_name = deck_names[0]
-        elif len(deck_names) == 2:
-            display_name = f"{deck_names[0]} + {deck_names[1]}"
+        self._stats_cache[cache_key] = (mod, combined_stats, html)
+        self._stats_cache.move_to_end(cache_key)
+        if len(self._stats_cache) > STATS_CACHE_SIZE:
+            self._stats_cache.popitem(last=False)
+
+        # Display HTML
+        self._set_displayed_stats(combined_stats)
+        self._show_report(html)
+
+    def _show_report(self, body: str):
+        """Display a report body, replacing the current report in place when possible."""
+        if self._report_page_loaded:
+            # Keep the loaded page (styles, scripts, modal) and only swap the report
+            self.webview.eval(
+                "closeModal(); charDataCache = {}; "
+                f"document.getElementById('report').innerHTML = {json.dumps(body, ensure_ascii=False)};")
         else:
-            display_name = f"{deck_names[0]} + {len(deck_names) - 1} other decks"
+            self.webview.stdHtml(_HTML_HEADER + _REPORT_START + body + _REPORT_END + _HTML_FOOTER)
+            self._report_page_loaded = True
 
-        stats = DeckStatistics(0, display_name)
+    def _set_displayed_stats(self, stats):
+        """Remember the stats shown in the webview, dropping details built for earlier ones."""
+        self._displayed_stats = stats
+        self._char_data_cache.clear()
 
-        # Combine hanzi from all selected decks and fields
-        total_hanzi_combined = set()
-        reviewed_hanzi_combined = set()
-
-        for config in deck_configs:
-            for field_value in config['fields']:
-                # Update config temporarily
-                self.config['fieldToUseForStats'] = field_value
-                self.calculator.config = self.config
-
-                # Get hanzi for this deck/field combination
-                field_total = self.calculator._get_hanzi_from_cards(
-                    config['subdeck_ids'], include_new=True, field_mode=field_value)
-                field_reviewed = self.calculator._get_hanzi_from_cards(
-                    config['subdeck_ids'], include_new=False, field_mode=field_value)
-
-                # Union with existing sets
-                total_hanzi_combined.update(field_total)
-                reviewed_hanzi_combined.update(field_reviewed)
-
-        stats.total_hanzi = total_hanzi_combined
-        stats.reviewed_hanzi = reviewed_hanzi_combined
-
-        # Categorize characters
-        if self.config.get('showCategories', True):
-            stats.total_categorized = self.calculator.character_data.categorize_characters(stats.total_hanzi)
-            stats.reviewed_categorized = self.calculator.character_data.categorize_characters(stats.reviewed_hanzi)
-
-        return stats
-
-    def _calculate_deck_stats_with_combined_fields(self, deck_id: int, deck_name: str,
-                                                     subdeck_ids: List[int], field_values: List[str]):
-        """Calculate stats for a deck combining multiple fields."""
-        from .stats_calculator import DeckStatistics
-
-        # Create descriptive name with selected fields
-        field_names = self._get_field_names_for_deck(deck_id)
-        field_labels = []
-
-        for field_value in field_values:
-            if field_value == 'all':
-                field_labels.append('All Fields')
-            elif field_value == 'sortField':
-                field_labels.append('Sort Field')
-            elif field_value.isdigit():
-                field_index = int(field_value) - 1
-                if 0 <= field_index < len(field_names):
-                    field_labels.append(field_names[field_index])
-                else:
-                    field_labels.append(f"Field {field_value}")
-            else:
-                field_labels.append(field_value)
-
-        if len(field_labels) == 1:
-            display_name = f"{deck_name} ({field_labels[0]})"
-        else:
-            display_name = f"{deck_name} ({', '.join(field_labels)})"
+    def _on_bridge_cmd(self, cmd: str):
+        """Handle pycmd messages from the stats webview."""
+        if not cmd.startswith('hanziChars:') or self._displayed_stats is None:
+            return
 
-        stats = DeckStatistics(deck_id, display_name)
+        _, category_type, category_name = cmd.split(':', 2)
+
+        # Build each category's payload once, however often its details are opened
+        key = (category_type, category_name)
+        char_data_json = self._char_data_cache.get(key)
+        if char_data_json is None:
+            # Character lists are only serialized when a row's details are opened
+            char_data = self._get_category_char_data(self._displayed_stats, category_type, category_name)
+            char_data_json = json.dumps(char_data, ensure_ascii=False)
+            self._char_data_cache[key] = char_data_json
+
+        self.webview.eval(f"fillCharacterDetails({char_data_json});")
+
+    def _get_category_char_data(self, stats: DeckStatistics, category_type: str,
+                                category_name: str) -> Dict:
+        """Get a category's reviewed, missing and not-in-deck characters for the details modal."""
+        total_chars = stats.total_categorized.get(category_type, {}).get(category_name, set())
+        reviewed_chars = stats.reviewed_categorized.get(category_type, {}).get(category_name, set())
+        official_category_chars = self._get_official_chars(category_type).get(category_name, set())
+
+        # Set differences run in C; skip them when there is nothing to subtract
+        missing_chars = total_chars - reviewed_chars if reviewed_chars else total_chars
+        not_in_deck_chars = official_category_chars - total_chars if total_chars else official_category_chars
+
+        # Lists are sent pre-joined, with their counts, as the modal displays them
+        return {
+            'key': f"{category_type}:{category_name}",
+            'category': category_name,
+            'reviewed': ' '.join(sorted(reviewed_chars)),
+            'missing': ' '.join(sorted(missing_chars)),
+            'notInDeck': ' '.join(sorted(not_in_deck_chars)),
+            'reviewedCount': len(reviewed_chars),
+            'missingCount': len(missing_chars),
+            'notInDeckCount': len(not_in_deck_chars)
+        }
+
+    def _get_official_chars(self, category_type: str) -> Dict[str, Set[str]]:
+        """Get the official character lists for HSK category types (empty for others)."""
+        if category_type == 'hsk_2012':
+            return self.calculator.character_data.get_official_hsk_2012_characters()
+        if category_type == 'hsk_2021':
+            return self.calculator.character_data.get_official_hsk_2021_characters()
+        return {}
+
+    def _show_error(self, e: Exception):
+        """Show an error page in the webview and log the traceback."""
+        self._report_page_loaded = False
+        error_html = f"""
+        <html>
+        <body style="font-family: sans-serif; padding: 20px;">
+            <h1 style="color: #d32f2f;">Error</h1>
+            <p>An error occurred while calculating statistics:</p>
+            <pre style="background-color: #f5f5f5; padding: 10px; border-radius: 5px;">{str(e)}</pre>
+        </body>
+        </html>
+        """
+        self.webview.stdHtml(error_html)
+        print(f"Error in refresh_stats: {e}")
+        import traceback
+        traceback.print_exception(type(e), e, e.__traceback__)
 
-        # Combine hanzi from all selected fields
-        total_hanzi_combined = set()
-        reviewed_hanzi_combined = set()
+    def _get_selected_deck_configs(self) -> List[Dict]:
+        """Collect the checked decks with their selected fields and subdecks."""
+        selected_deck_configs = []
 
-        for field_value in field_values:
-            # Update config temporarily
-            self.config['fieldToUseForStats'] = field_value
-            self.calculator.config = self.config
+        for deck_id, deck_info in self.deck_data.items():
+            if not deck_info['checkbox'].isChecked():
+                continue  # Skip unselected decks
 
-            # Get hanzi for this field
-            field_total = self.calculator._get_hanzi_from_cards(subdeck_ids, include_new=True, field_mode=field_value)
-            field_reviewed = self.calculator._get_hanzi_from_cards(subdeck_ids, include_new=False, field_mode=field_value)
+            # Get selected fields for this deck
+            selected_fields = []
+            for field_value, field_cb in deck_info['fields']:
+                if field_cb.isChecked():
+                    selected_fields.append(field_value)
 
-            # Union with existing sets
-            total_hanzi_combined.update(field_total)
-            reviewed_hanzi_combined.update(field_reviewed)
+            # If no fields selected, skip this deck
+            if not selected_fields:
+                continue
 
-        stats.total_hanzi = total_hanzi_combined
-        stats.reviewed_hanzi = reviewed_hanzi_combined
+            # Get selected subdecks
+            selected_subdeck_ids = [deck_id]  # Always include the main deck
+            for sub_id, sub_name, subdeck_cb in deck_info['subdecks']:
+                if subdeck_cb.isChecked():
+                    selected_subdeck_ids.append(sub_id)
 
-        # Categorize characters
-        if self.config.get('showCategories', True):
-            stats.total_categorized = self.calculator.character_data.categorize_characters(stats.total_hanzi)
-            stats.reviewed_categorized = self.calculator.character_data.categorize_characters(stats.reviewed_hanzi)
+            selected_deck_configs.append({
+                'deck_id': deck_id,
+                'deck_name': deck_info['name'],
+                'subdeck_ids': selected_subdeck_ids,
+                'fields': selected_fields
+            })
 
-        return stats
+        return selected_deck_configs
 
-    def _calculate_deck_stats_with_specific_decks(self, deck_id: int, deck_name: str,
-                                                    subdeck_ids: List[int], field_value: str):
-        """Calculate stats for a deck with specific subdeck IDs."""
+    def _calculate_combined_stats(self, deck_configs: List[Dict], mod: int):
+        """Calculate combined statistics from multiple decks."""
         from .stats_calculator import DeckStatistics
 
-        # Create stats object with a descriptive name
-        # Get the actual field name for this deck
-        field_names = self._get_field_names_for_deck(deck_id)
-
-        if field_value == 'all':
-            field_label = 'All Fields'
-        elif field_value == 'sortField':
-            field_label = 'Sort Field'
-        elif field_value.isdigit():
-            field_index = int(field_value) - 1  # Convert to 0-based index
-            if 0 <= field_index < len(field_names):
-                field_label = field_names[field_index]
-            else:
-                field_label = f"Field {field_value}"
+        # Build display name from all selected decks
+        deck_names = [config['deck_name'] for config in deck_configs]
+        if len(deck_names) == 1:
+            display_name = deck_names[0]
+        elif len(deck_names) == 2:
+            display_name = f"{deck_names[0]} + {deck_names[1]}"
         else:
-            field_label = field_value
+            display_name = f"{deck_names[0]} + {len(deck_names) - 1} other decks"
 
-        display_name = f"{deck_name} ({field_label})"
+        stats = DeckStatistics(0, display_name)
 
-        stats = DeckStatistics(deck_id, display_name)
+        # Combine hanzi from all selected decks and fields
+        total_hanzi_combined = set()
+        reviewed_hanzi_combined = set()
 
-        # Get field mode
-        field_mode = field_value
+        for config in deck_configs:
+            for field_value in config['fields']:
+                # Get hanzi for this deck/field combination
+                field_total, field_reviewed = self._get_field_hanzi(config['subdeck_ids'], field_value, mod)
 
-        # Query for all cards (including new/unseen cards)
-        stats.total_hanzi = self.calculator._get_hanzi_from_cards(subdeck_ids, include_new=True, field_mode=field_mode)
+                # Union with existing sets
+                total_hanzi_combined.update(field_total)
+                reviewed_hanzi_combined.update(field_reviewed)
 
-        # Query for only reviewed cards
-        stats.reviewed_hanzi = self.calculator._get_hanzi_from_cards(subdeck_ids, include_new=False, field_mode=field_mode)
+        stats.total_hanzi = total_hanzi_combined
+        stats.reviewed_hanzi = reviewed_hanzi_combined
 
         # Categorize characters
-        if self.config.get('showCategories', True):
-            stats.total_categorized = self.calculator.character_data.categorize_characters(stats.total_hanzi)
-            stats.reviewed_categorized = self.calculator.character_data.categorize_characters(stats.reviewed_hanzi)
+        self.calculator._categorize_stats(stats)
 
         return stats
 
+    def _get_field_hanzi(self, deck_ids: List[int], field_value: str, mod: int) -> Tuple[frozenset, frozenset]:
+        """Get the Hanzi in one field of all and of reviewed cards in the given decks, reusing earlier queries."""
+        key = (tuple(sorted(deck_ids)), field_value)
+        cached = self._hanzi_cache.get(key)
+        if cached is not None and cached[0] == mod:
+            return cached[1], cached[2]
+        total_hanzi, reviewed_hanzi = self.calculator._get_hanzi_total_and_reviewed(deck_ids, field_value)
+        total_hanzi, reviewed_hanzi = frozenset(total_hanzi), frozenset(reviewed_hanzi)
+        # Stamped with the mod the calculation started from, so results of a
+        # calculation that raced with a collection change are never reused
+        self._hanzi_cache[key] = (mod, total_hanzi, reviewed_hanzi)
+        return total_hanzi, reviewed_hanzi
+
     def _generate_no_selection_html(self) -> str:
         """Generate HTML when no decks are selected."""
-        html = self._get_html_header()
-        html += """
-        <h1>Hanzi Deck Statistics</h1>
-        <p style="font-size: 1.2em; color: #666; margin-top: 50px; text-align: center;">
-            Please select at least one deck and one field to view statistics.
-        </p>
-        </body></html>
-        """
-        return html
-
-    def _generate_multi_deck_html(self, all_stats: List[DeckStatistics]) -> str:
-        """Generate HTML report for multiple decks."""
-        html = self._get_html_header()
-        html += "<h1>Hanzi Statistics - All Decks</h1>"
-
-        # Generate section for each deck
-        for stats in all_stats:
-            html += self._generate_deck_section(stats)
-
-        html += "</body></html>"
-        return html
-
-    def _generate_single_deck_html(self, stats: DeckStatistics) -> str:
-        """Generate HTML report for a single deck."""
-        html = self._get_html_header()
-        html += f"<h1>Hanzi Statistics - {stats.deck_name}</h1>"
-        html += self._generate_deck_section(stats, show_title=False)
-        html += "</body></html>"
-        return html
-
-    def _generate_deck_section(self, stats: DeckStatistics, show_title: bool = True) -> str:
-        """Generate HTML section for a single deck's statistics."""
+        return _NO_SELECTION_HTML
+
+    def _generate_single_deck_body(self, stats: DeckStatistics) -> str:
+        """Generate the report body (everything inside the report container) for a single deck."""
+        out = [f"<h1>Hanzi Statistics - {stats.deck_name}</h1>"]
+        self._generate_deck_section(stats, out, show_title=False)
+        return "".join(out)
+
+    def _generate_deck_section(self, stats: DeckStatistics, out: List[str], show_title: bool = True):
+        """Append the HTML section for a single deck's statistics to out."""
         total_count = len(stats.total_hanzi)
         reviewed_count = len(stats.reviewed_hanzi)
         reviewed_pct = (reviewed_count / total_count * 100) if total_count > 0 else 0
 
-        html = ""
-
         if show_title:
-            html += f"<h2>{stats.deck_name}</h2>"
+            out.append(f"<h2>{stats.deck_name}</h2>")
 
         # Summary table
-        html += """
-        <table class="summary-table">
-            <tr>
-                <th>Metric</th>
-                <th>Count</th>
-                <th>Percentage</th>
-                <th>Progress</th>
-            </tr>
-        """
-
-        html += f"""
-            <tr>
-                <td><strong>Total Hanzi</strong></td>
-                <td>{total_count}</td>
-                <td>100%</td>
-                <td>
-                    <div class="progress">
-                        <div class="progress-bar" style="width: 100%"></div>
-                    </div>
-                </td>
-            </tr>
-            <tr>
-                <td><strong>Reviewed Hanzi</strong></td>
-                <td>{reviewed_count}</td>
-                <td>{reviewed_pct:.1f}%</td>
-                <td>
-                    <div class="progress">
-                        <div class="progress-bar progress-bar-reviewed" style="width: {reviewed_pct}%"></div>
-                    </div>
-                </td>
-            </tr>
-        """
-
-        html += "</table>"
+        out.append(_SUMMARY_TABLE_TEMPLATE.format(
+            total_count=total_count, reviewed_count=reviewed_count, reviewed_pct=reviewed_pct))
 
         # Category breakdown if enabled
-        if self.config.get('showCategories', True):
-            html += self._generate_category_breakdown(stats)
-
-        return html
-
-    def _generate_category_breakdown(self, stats: DeckStatistics) -> str:
-        """Generate HTML for category breakdown (HSK levels, frequency)."""
-        html = "<h3>Category Breakdown</h3>"
+        if self._show_categories:
+            self._generate_category_breakdown(stats, out)
 
-        categories_to_show = self.config.get('categoriesToShow', [])
+    def _generate_category_breakdown(self, stats: DeckStatistics, out: List[str]):
+        """Append the HTML for the category breakdown (HSK levels, frequency) to out."""
+        out.append("<h3>Category Breakdown</h3>")
 
         # HSK 2012 (2.0)
-        if any('HSK 2.0' in cat or 'Level' in cat for cat in categories_to_show):
-            html += "<h4>HSK 2.0 (2012)</h4>"
-            html += self._generate_category_table(stats, 'hsk_2012')
+        if self._show_hsk_2012:
+            out.append("<h4>HSK 2.0 (2012)</h4>")
+            self._generate_category_table(stats, 'hsk_2012', out)
 
         # HSK 2021 (3.0)
-        if any('HSK 3.0' in cat or 'Band' in cat for cat in categories_to_show):
-            html += "<h4>HSK 3.0 (2021)</h4>"
-            html += self._generate_category_table(stats, 'hsk_2021')
+        if self._show_hsk_2021:
+            out.append("<h4>HSK 3.0 (2021)</h4>")
+            self._generate_category_table(stats, 'hsk_2021', out)
 
         # Frequency
-        if any('Top' in cat for cat in categories_to_show):
-            html += "<h4>Frequency</h4>"
-            html += self._generate_category_table(stats, 'frequency')
-
-        return html
-
-    def _generate_category_table(self, stats: DeckStatistics, category_type: str) -> str:
-        """Generate HTML table for a specific category type."""
-        import json
-        import html as html_module
+        if self._show_frequency:
+            out.append("<h4>Frequency</h4>")
+            self._generate_category_table(stats, 'frequency', out)
 
+    def _generate_category_table(self, stats: DeckStatistics, category_type: str, out: List[str]):
+        """Append the HTML table for a specific category type to out."""
         total_cat = stats.total_categorized.get(category_type, {})
         reviewed_cat = stats.reviewed_categorized.get(category_type, {})
 
         if not total_cat:
-            return "<p><em>No data available</em></p>"
+            out.append("<p><em>No data available</em></p>")
+            return
 
         # Get official character lists for HSK types
-        official_chars = {}
-        if category_type == 'hsk_2012':
-            official_chars = self.calculator.character_data.get_official_hsk_2012_characters()
-        elif category_type == 'hsk_2021':
-            official_chars = self.calculator.character_data.get_official_hsk_2021_characters()
+        official_chars = self._get_official_chars(category_type)
 
-        html = """
-        <table class="category-table">
-            <tr>
-                <th>Category</th>
-                <th class="tooltip-header" data-tooltip="Total unique Hanzi in this category found in your deck">In Deck ℹ️</th>
-                <th class="tooltip-header" data-tooltip="Hanzi you've reviewed at least once">Reviewed ℹ️</th>
-        """
+        out.append(_CATEGORY_TABLE_HEADER)
 
         # Add Official column for HSK categories
         if official_chars:
-            html += '<th class="tooltip-header" data-tooltip="Total Hanzi in official HSK list for this category">Official ℹ️</th>'
+            out.append(_OFFICIAL_COLUMN_HEADER)
 
-        html += """
-                <th>Progress</th>
-            </tr>
-        """
+        out.append(_CATEGORY_TABLE_HEADER_END)
+
+        # Bind per-row helpers once outside the loop
+        escape = html_module.escape
+        row_template = _CATEGORY_ROW_TEMPLATE.format
 
         for category_name, total_chars in total_cat.items():
-            reviewed_chars = reviewed_cat.get(category_name, set())
+            # Only show categories with characters, in the deck or the official list
+            official_category_chars = official_chars.get(category_name)
+            if not total_chars and not official_category_chars:
+                continue
+
             total_count = len(total_chars)
-            reviewed_count = len(reviewed_chars)
+            reviewed_count = len(reviewed_cat.get(category_name, ()))
             pct = (reviewed_count / total_count * 100) if total_count > 0 else 0
 
-            # Calculate missing characters
-            missing_chars = total_chars - reviewed_chars
-
-            # Get official characters and calculate not-in-deck
-            official_category_chars = official_chars.get(category_name, set()) if official_chars else set()
-            not_in_deck_chars = official_category_chars - total_chars
-            official_count = len(official_category_chars)
-
-            if total_count > 0 or official_count > 0:  # Show categories with characters
-                # Prepare character data for JavaScript
-                char_data = {
-                    'reviewed': sorted(list(reviewed_chars)),
-                    'missing': sorted(list(missing_chars)),
-                    'notInDeck': sorted(list(not_in_deck_chars)),
-                    'category': category_name
-                }
-                char_data_json = html_module.escape(json.dumps(char_data))
-
-                html += f"""
-                <tr class="clickable-row" data-chars='{char_data_json}' onclick="showCharacterDetails(this)" title="Click to see character details">
-                    <td>{category_name}</td>
-                    <td>{total_count}</td>
-                    <td>{reviewed_count}</td>
-                """
-
-                # Add official count if applicable
-                if official_chars:
-                    html += f"<td>{official_count}</td>"
-
-                html += f"""
-                    <td>
-                        <div class="progress">
-                            <div class="progress-bar progress-bar-category" style="width: {pct}%"></div>
-                        </div>
-                    </td>
-                </tr>
-                """
-
-        html += "</table>"
-        return html
-
-    def _get_html_header(self) -> str:
-        """Get HTML header with styles."""
-        return """
-        <html>
-        <head>
-            <style>
-                body {
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    padding: 20px;
-                    color: #333;
-                    background-color: #fafafa;
-                }
-                h1 {
-                    color: #1976d2;
-                    border-bottom: 3px solid #1976d2;
-                    padding-bottom: 10px;
-                }
-                h2 {
-                    color: #424242;
-                    border-bottom: 2px solid #e0e0e0;
-                    padding-bottom: 8px;
-                    margin-top: 30px;
-                }
-                h3 {
-                    color: #616161;
-                    margin-top: 25px;
-                }
-                h4 {
-                    color: #757575;
-                    margin-top: 20px;
-                    margin-bottom: 10px;
-                }
-                table {
-                    border-collapse: collapse;
-                    width: 100%;
-                    background-color: white;
-                    box-shadow: 0 1px 3px rgba(0,0,0,0.12);
-                    border-radius: 4px;
-                    margin-bottom: 20px;
-                }
-                th, td {
-                    padding: 12px 16px;
-                    text-align: left;
-                }
-                th {
-                    background-color: #f5f5f5;
-                    font-weight: 600;
-                    color: #424242;
-                    border-bottom: 2px solid #e0e0e0;
-                }
-                .tooltip-header {
-                    position: relative;
-                    cursor: help;
-                }
-                .tooltip-header:hover::after {
-                    content: attr(data-tooltip);
-                    position: absolute;
-                    bottom: 100%;
-                    left: 50%;
-                    transform: translateX(-50%);
-                    background-color: #333;
-                    color: white;
-                    padding: 8px 12px;
-                    border-radius: 4px;
-                    white-space: nowrap;
-                    font-size: 12px;
-                    font-weight: normal;
-                    z-index: 100;
-                    margin-bottom: 5px;
-                    box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-                }
-                .tooltip-header:hover::before {
-                    content: '';
-                    position: absolute;
-                    bottom: 100%;
-                    left: 50%;
-                    transform: translateX(-50%);
-                    border: 5px solid transparent;
-                    border-top-color: #333;
-                    z-index: 100;
-                }
-                td {
-                    border-bottom: 1px solid #f0f0f0;
-                }
-                tr:last-child td {
-                    border-bottom: none;
-                }
-                tr:hover {
-                    background-color: #fafafa;
-                }
-                .summary-table {
-                    font-size: 1.1em;
-                }
-                .category-table {
-                    font-size: 0.95em;
-                    margin-left: 20px;
-                }
-                .clickable-row {
-                    cursor: pointer;
-                    transition: background-color 0.2s;
-                }
-                .clickable-row:hover {
-                    background-color: #e3f2fd !important;
-                }
-                .progress {
-                    background-color: #e0e0e0;
-                    height: 24px;
-                    border-radius: 12px;
-                    overflow: hidden;
-                    min-width: 100px;
-                }
-                .progress-bar {
-                    background: linear-gradient(90deg, #4CAF50 0%, #45a049 100%);
-                    height: 100%;
-                    transition: width 0.3s ease;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    color: white;
-                    font-size: 0.85em;
-                    font-weight: 500;
-                }
-                .progress-bar-reviewed {
-                    background: linear-gradient(90deg, #2196F3 0%, #1976D2 100%);
-                }
-                .progress-bar-category {
-                    background: linear-gradient(90deg, #FF9800 0%, #F57C00 100%);
-                }
-
-                /* Modal styles */
-                .modal {
-                    display: none;
-                    position: fixed;
-                    z-index: 1000;
-                    left: 0;
-                    top: 0;
-                    width: 100%;
-                    height: 100%;
-                    overflow: auto;
-                    background-color: rgba(0,0,0,0.5);
-                }
-                .modal-content {
-                    background-color: #fefefe;
-                    margin: 5% auto;
-                    padding: 0;
-                    border: 1px solid #888;
-                    border-radius: 8px;
-                    width: 80%;
-                    max-width: 800px;
-                    max-height: 80vh;
-                    display: flex;
-                    flex-direction: column;
-                    box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-                }
-                .modal-header {
-                    padding: 20px;
-                    background-color: #1976d2;
-                    color: white;
-                    border-radius: 8px 8px 0 0;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }
-                .modal-header h2 {
-                    margin: 0;
-                    color: white;
-                    border: none;
-                    padding: 0;
-                }
-                .modal-body {
-                    padding: 20px;
-                    overflow-y: auto;
-                    flex: 1;
-                }
-                .close {
-                    color: white;
-                    font-size: 32px;
-                    font-weight: bold;
-                    cursor: pointer;
-                    line-height: 1;
-                    padding: 0 10px;
-                }
-                .close:hover {
-                    opacity: 0.7;
-                }
-                .char-section {
-                    margin-bottom: 25px;
-                }
-                .char-section h3 {
-                    color: #424242;
-                    margin-top: 0;
-                    margin-bottom: 12px;
-                    padding-bottom: 8px;
-                    border-bottom: 2px solid #e0e0e0;
-                }
-                .char-list {
-                    font-size: 28px;
-                    line-height: 1.8;
-                    letter-spacing: 8px;
-                    padding: 15px;
-                    background-color: #f5f5f5;
-                    border-radius: 4px;
-                    word-wrap: break-word;
-                }
-                .reviewed-section .char-list {
-                    background-color: #e8f5e9;
-                }
-                .missing-section .char-list {
-                    background-color: #ffebee;
-                }
-                .not-in-deck-section .char-list {
-                    background-color: #fff3e0;
-                }
-                .char-count {
-                    font-size: 14px;
-                    color: #666;
-                    margin-top: 8px;
-                    font-style: italic;
-                }
-            </style>
-            <script>
-                function showCharacterDetails(row) {
-                    var charData = JSON.parse(row.getAttribute('data-chars'));
-                    var modal = document.getElementById('charModal');
-                    var modalTitle = document.getElementById('modalTitle');
-                    var reviewedChars = document.getElementById('reviewedChars');
-                    var missingChars = document.getElementById('missingChars');
-                    var notInDeckChars = document.getElementById('notInDeckChars');
-                    var reviewedCount = document.getElementById('reviewedCount');
-                    var missingCount = document.getElementById('missingCount');
-                    var notInDeckCount = document.getElementById('notInDeckCount');
-                    var notInDeckSection = document.getElementById('notInDeckSection');
-
-                    modalTitle.textContent = charData.category + ' - Character Details';
-                    reviewedChars.textContent = charData.reviewed.join(' ') || 'None';
-                    missingChars.textContent = charData.missing.join(' ') || 'None';
-                    reviewedCount.textContent = charData.reviewed.length + ' characters';
-                    missingCount.textContent = charData.missing.length + ' characters';
-
-                    // Show/hide "Not in Deck" section based on whether we have data
-                    if (charData.notInDeck && charData.notInDeck.length > 0) {
-                        notInDeckChars.textContent = charData.notInDeck.join(' ');
-                        notInDeckCount.textContent = charData.notInDeck.length + ' characters';
-                        notInDeckSection.style.display = 'block';
-                    } else {
-                        notInDeckSection.style.display = 'none';
-                    }
-
-                    modal.style.display = 'block';
-                }
-
-                function closeModal() {
-                    document.getElementById('charModal').style.display = 'none';
-                }
-
-                window.onclick = function(event) {
-                    var modal = document.getElementById('charModal');
-                    if (event.target == modal) {
-                        modal.style.display = 'none';
-                    }
-                }
-            </script>
-        </head>
-        <body>
-            <!-- Modal -->
-            <div id="charModal" class="modal">
-                <div class="modal-content">
-                    <div class="modal-header">
-                        <h2 id="modalTitle">Character Details</h2>
-                        <span class="close" onclick="closeModal()">&times;</span>
-                    </div>
-                    <div class="modal-body">
-                        <div class="char-section reviewed-section">
-                            <h3>✓ Reviewed Characters</h3>
-                            <div class="char-list" id="reviewedChars"></div>
-                            <div class="char-count" id="reviewedCount"></div>
-                        </div>
-                        <div class="char-section missing-section">
-                            <h3>✗ Not Yet Reviewed</h3>
-                            <div class="char-list" id="missingChars"></div>
-                            <div class="char-count" id="missingCount"></div>
-                        </div>
-                        <div class="char-section not-in-deck-section" id="notInDeckSection">
-                            <h3>⊘ Not in Deck</h3>
-                            <div class="char-list" id="notInDeckChars"></div>
-                            <div class="char-count" id="notInDeckCount"></div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        """
+            # Add official count if applicable
+            official_cell = ""
+            if official_chars:
+                official_cell = _OFFICIAL_COLUMN_TEMPLATE.format(
+                    official_count=len(official_category_chars or ()))
+
+            # Rows only identify their category; the character lists are
+            # fetched from Python when the details modal is opened
+            out.append(row_template(
+                category_type=category_type,
+                category_attr=escape(category_name, quote=True),
+                category_name=category_name,
+                total_count=total_count, reviewed_count=reviewed_count,
+                official_cell=official_cell, pct=pct))
+
+        out.append("</table>")
 
 
 def show_stats_dialog():